@@ -15,35 +15,41 @@ Tip: In your PDF viewer / printer settings, print at 100% (no "Fit to page"/"Shr
 
 from __future__ import annotations
 
-import math
 import os
+import functools
 import sys
 import json
+import queue
+import hashlib
+import importlib.metadata
+import multiprocessing
 import argparse
+import threading
 import subprocess
-from io import BytesIO
 from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Literal, Tuple
+from typing import Callable, Literal, Tuple
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 
 from reportlab.pdfgen import canvas as rl_canvas
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import mm, cm
-from reportlab.lib.utils import ImageReader
-from reportlab.graphics import renderPM
-from reportlab.graphics.barcode import code128, createBarcodeDrawing
+from reportlab.lib.units import mm, cm, inch
+from reportlab.graphics.barcode import code128
 
 import qrcode
-from PIL import Image, ImageTk, ImageDraw, ImageFont
+from PIL import Image, ImageTk, ImageDraw, ImageFont, PngImagePlugin
 
 from . import __version__
 
 
 BarcodeKind = Literal["QR", "CODE128"]
 StatusLevel = Literal["info", "success", "warn", "error"]
+QrMatrix = tuple[tuple[bool, ...], ...]  # True = dunkles Modul
+QrRuns = tuple[int, tuple[tuple[int, int, int], ...]]  # (Modulanzahl, dunkle Läufe (x, y, Breite))
 
 STATUS_COLORS: dict[StatusLevel, str] = {
     "info": "#2b2b2b",
@@ -115,40 +121,134 @@ LAYOUTS: dict[str, SheetLayout] = {
 DEFAULT_LAYOUT_KEY = "L4731"
 AVERY_L4731 = LAYOUTS[DEFAULT_LAYOUT_KEY]
 DEFAULT_PROFILE_NAME = "Brother MFC-L2710DW"
+PREVIEW_CACHE_SIZE = 16
+# Worker-Prozesse für die QR-Kodierung erst ab so vielen neu zu kodierenden Texten starten
+# (~2 ms pro Text vs. ~0.4 s Start pro "spawn"-Worker, der app inkl. tkinter/reportlab importiert).
+PARALLEL_QR_MIN_LABELS = 400
+# Mindestanzahl Texte pro Worker, damit sich dessen Start amortisiert.
+PARALLEL_QR_MIN_CHUNK = 200
+QR_MATRIX_CACHE_SIZE = 4096
+# Obergrenze für den QR-Disk-Cache: eine PNG pro Text, belegt je ~1 Dateisystem-Block (~4 KB) -> max. ~40 MB.
+QR_DISK_CACHE_MAX_FILES = 10_000
+QR_DISK_CACHE_TEXT_KEY = "asn"  # PNG-Textchunk mit dem kodierten Text, wird beim Laden verglichen
 
 
 def make_asn_text(prefix: str, number: int, leading_zeros: int) -> str:
     return f"{prefix}{number:0{leading_zeros}d}"
 
 
-def make_qr_image(data: str, target_px: int) -> Image.Image:
+QR_BORDER = 2  # Ruhezone in Modulen
+
+
+_qr_matrix_cache: OrderedDict[str, QrMatrix] = OrderedDict()
+_qr_matrix_cache_lock = threading.Lock()  # Vorschau (Mainloop) und PDF-Worker-Thread teilen den Cache
+
+
+def cached_qr_matrix(data: str) -> QrMatrix | None:
+    """QR matrix for data if it is already in the in-process cache, else None (no encoding)."""
+    with _qr_matrix_cache_lock:
+        matrix = _qr_matrix_cache.get(data)
+        if matrix is not None:
+            _qr_matrix_cache.move_to_end(data)
+        return matrix
+
+
+def make_qr_matrix(data: str) -> QrMatrix:
+    """QR module matrix incl. QR_BORDER quiet zone (True = dark). Cached per text (LRU)."""
+    matrix = cached_qr_matrix(data)
+    if matrix is not None:
+        return matrix
     qr = qrcode.QRCode(
         version=None,
         error_correction=qrcode.constants.ERROR_CORRECT_M,
-        box_size=10,
-        border=2,
+        box_size=1,
+        border=QR_BORDER,
     )
     qr.add_data(data)
+    # ~90% der Zeit entfallen auf die Bewertung der 8 Maskenmuster (ISO 18004 verlangt die
+    # Maske mit der geringsten Strafpunktzahl). Eine feste Maske wäre schneller, aber nicht
+    # normkonform; wiederholte Texte übernimmt stattdessen der Cache.
     qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white").convert("RGB")
-    return img.resize((target_px, target_px), Image.Resampling.LANCZOS)
+    matrix = tuple(tuple(row) for row in qr.get_matrix())
+    with _qr_matrix_cache_lock:
+        _qr_matrix_cache[data] = matrix
+        if len(_qr_matrix_cache) > QR_MATRIX_CACHE_SIZE:
+            _qr_matrix_cache.popitem(last=False)
+    return matrix
+
+
+def make_qr_image(data: str, target_px: int) -> Image.Image:
+    """1-bit QR bitmap with a whole number of pixels per module, at most target_px wide."""
+    matrix = make_qr_matrix(data)
+    n = len(matrix)
+    img = Image.new("1", (n, n))
+    img.putdata([0 if dark else 255 for row in matrix for dark in row])
+    # QR-Module sind binär: ganzzahliger NEAREST-Faktor -> alle Module gleich groß, keine Grau-Säume.
+    px = n * max(1, target_px // n)
+    return img.resize((px, px), Image.Resampling.NEAREST)
+
+
+# reportlab-Defaults für Code128 (Modulbreite + Ruhezone), damit die Geometrie unverändert bleibt.
+CODE128_BAR_WIDTH = code128.Code128.barWidth
+CODE128_QUIET = max(0.25 * inch, 10.0 * CODE128_BAR_WIDTH)
+
+
+@functools.lru_cache(maxsize=4096)
+def code128_bars(data: str) -> tuple[tuple[int, int], ...]:
+    """Dark bars of the Code128 symbol as (start, width) in modules, without quiet zones. Cached per text."""
+    b = code128.Code128(data, humanReadable=False)
+    b.validate()
+    b.encode()
+    b.decompose()
+    # decomposed: Großbuchstabe = Strich, Kleinbuchstabe = Lücke, Position im Alphabet = Breite.
+    bars = []
+    left = 0
+    for ch in b.decomposed:
+        w = ord(ch.lower()) - ord("a") + 1
+        if ch.isupper():
+            bars.append((left, w))
+        left += w
+    return tuple(bars)
+
+
+def draw_code128_vector(
+    c: rl_canvas.Canvas,
+    x: float,
+    y: float,
+    max_w: float,
+    height: float,
+    bars: tuple[tuple[int, int], ...],
+) -> None:
+    """Draw Code128 bars (incl. quiet zones) at [x, y], shrunk horizontally to fit max_w."""
+    modules = bars[-1][0] + bars[-1][1]  # Stop-Muster endet mit einem Strich
+    scale = min(1.0, max_w / (2 * CODE128_QUIET + modules * CODE128_BAR_WIDTH))
+    c.saveState()
+    c.translate(x + CODE128_QUIET * scale, y)
+    c.scale(CODE128_BAR_WIDTH * scale, 1.0)
+    # x in Modul-Einheiten (ganzzahlig -> kompakter Content-Stream), y in Punkten.
+    # Einzelne Rechtecke wie reportlabs Code128.draw(), damit Viewer/Drucker gleich rastern.
+    for start, w in bars:
+        c.rect(start, 0, w, height, stroke=0, fill=1)
+    c.restoreState()
 
 
 def make_code128_preview_image(data: str, target_w: int, target_h: int) -> Image.Image:
     try:
-        drawing = createBarcodeDrawing(
-            "Code128",
-            value=data,
-            barHeight=max(18.0, target_h * 0.55),
-            barWidth=0.24 * mm,
-            humanReadable=False,
-        )
-        png_bytes = renderPM.drawToString(drawing, fmt="PNG")
-        img = Image.open(BytesIO(png_bytes)).convert("RGB")
-        img.thumbnail((max(10, target_w), max(10, target_h)), Image.Resampling.LANCZOS)
-        return img
+        # Direkt aus den gecachten Strichen zeichnen (wie beim PDF), ohne renderPM/PNG-Umweg.
+        bars = code128_bars(data)
+        modules = bars[-1][0] + bars[-1][1]
+        px = max(1, target_w // modules)
+        img = Image.new("1", (modules * px, max(10, target_h)), 1)
+        draw = ImageDraw.Draw(img)
+        for start, w in bars:
+            draw.rectangle([start * px, 0, (start + w) * px - 1, img.height - 1], fill=0)
+        if img.width > target_w:
+            # Breiter als die Box (lange Texte): flächengemittelt verkleinern, damit schmale
+            # Striche als Grautöne erhalten bleiben statt wie bei NEAREST zu verschwinden.
+            img = img.convert("L").resize((max(10, target_w), img.height), Image.Resampling.BOX)
+        return img.convert("RGB")
     except Exception:
-        # Fallback: simple barcode-like preview, falls Render-Pipeline fehlt.
+        # Fallback: simple barcode-like preview, falls der Text nicht kodierbar ist.
         fallback = Image.new("RGB", (max(10, target_w), max(10, target_h)), "white")
         draw = ImageDraw.Draw(fallback)
         x = 2
@@ -159,12 +259,20 @@ def make_code128_preview_image(data: str, target_w: int, target_h: int) -> Image
         return fallback
 
 
+@functools.lru_cache(maxsize=None)
+def _load_preview_font(size: int) -> ImageFont.FreeTypeFont | None:
+    """DejaVuSans in the given size, loaded (file open + TTF parse) only once per size."""
+    try:
+        return ImageFont.truetype("DejaVuSans.ttf", size)
+    except Exception:
+        return None
+
+
 def fit_preview_font(draw: ImageDraw.ImageDraw, text: str, max_w: int, max_h: int) -> ImageFont.ImageFont:
     max_size = max(10, min(42, max_h))
     for size in range(max_size, 9, -1):
-        try:
-            font = ImageFont.truetype("DejaVuSans.ttf", size)
-        except Exception:
+        font = _load_preview_font(size)
+        if font is None:
             break
         bbox = draw.textbbox((0, 0), text, font=font)
         w = bbox[2] - bbox[0]
@@ -184,6 +292,181 @@ def open_path(path: str) -> None:
     subprocess.Popen(["xdg-open", path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 
+def config_dir() -> Path:
+    """
+    Cross-platform config directory:
+    - Windows: %APPDATA%/paperless-ngx-asn-labels
+    - macOS: ~/Library/Application Support/paperless-ngx-asn-labels
+    - Linux: $XDG_CONFIG_HOME/paperless-ngx-asn-labels  (fallback ~/.config/...)
+    """
+    home = Path.home()
+
+    if os.name == "nt":
+        base = Path(os.environ.get("APPDATA", home / "AppData" / "Roaming"))
+    elif sys.platform == "darwin":
+        base = home / "Library" / "Application Support"
+    else:
+        base = Path(os.environ.get("XDG_CONFIG_HOME", home / ".config"))
+
+    return base / "paperless-ngx-asn-labels"
+
+
+def default_qr_cache_dir() -> Path:
+    """Versioned QR disk cache below config_dir(); a new qrcode release starts a fresh cache."""
+    try:
+        qrcode_version = importlib.metadata.version("qrcode")
+    except Exception:
+        qrcode_version = "unknown"
+    # v1: Matrix inkl. QR_BORDER als 1-bit PNG, Fehlerkorrektur M.
+    return config_dir() / "qr_cache" / f"v1-qrcode-{qrcode_version}"
+
+
+def _qr_cache_file(cache_dir: Path, text: str) -> Path:
+    return cache_dir / (hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest() + ".png")
+
+
+def load_qr_disk_cache(cache_dir: Path, texts: list[str]) -> dict[str, QrMatrix]:
+    """Read cached QR matrices for texts; missing, unreadable or mismatching entries are skipped."""
+    found: dict[str, QrMatrix] = {}
+    for text in texts:
+        path = _qr_cache_file(cache_dir, text)
+        try:
+            with Image.open(path) as img:
+                n = img.width
+                modules = n - 2 * QR_BORDER
+                # Nur gültige QR-Größen (Version 1-40: 21..177 Module in 4er-Schritten) und
+                # nur Einträge, deren gespeicherter Text passt (Hash-Kollision, fremde Dateien).
+                if img.height != n or modules < 21 or modules > 177 or (modules - 21) % 4 != 0:
+                    continue
+                if getattr(img, "text", {}).get(QR_DISK_CACHE_TEXT_KEY) != text:
+                    continue
+                pixels = list(img.convert("1").getdata())
+            found[text] = tuple(tuple(v == 0 for v in pixels[i * n:(i + 1) * n]) for i in range(n))
+            os.utime(path)  # Zugriffszeit für die LRU-Bereinigung
+        except Exception:
+            continue
+    return found
+
+
+def store_qr_disk_cache(cache_dir: Path, matrices: dict[str, QrMatrix]) -> None:
+    """Write QR matrices as 1-bit PNGs and trim the cache to QR_DISK_CACHE_MAX_FILES (best effort)."""
+    if not matrices:
+        return
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for text, matrix in matrices.items():
+            n = len(matrix)
+            img = Image.new("1", (n, n))
+            img.putdata([0 if dark else 255 for row in matrix for dark in row])
+            info = PngImagePlugin.PngInfo()
+            info.add_itxt(QR_DISK_CACHE_TEXT_KEY, text)
+            path = _qr_cache_file(cache_dir, text)
+            tmp = path.with_suffix(".tmp")
+            img.save(tmp, format="PNG", optimize=True, pnginfo=info)
+            tmp.replace(path)
+
+        entries = [e for e in os.scandir(cache_dir) if e.name.endswith(".png")]
+        if len(entries) > QR_DISK_CACHE_MAX_FILES:
+            entries.sort(key=lambda e: e.stat().st_mtime)
+            for e in entries[: len(entries) - QR_DISK_CACHE_MAX_FILES]:
+                os.unlink(e.path)
+    except Exception:
+        # Cache ist optional: Schreibfehler (z.B. read-only Home) ignorieren.
+        pass
+
+
+@functools.lru_cache(maxsize=4096)
+def qr_module_runs(matrix: QrMatrix) -> QrRuns:
+    """Module count and dark runs (x, y, width) of a QR matrix outside the finder patterns.
+
+    Coordinates are in modules with y pointing up, ready to be emitted as PDF rectangles.
+    Cached per matrix, so repeated texts skip the run extraction.
+    """
+    n = len(matrix)
+    # Finder-Zonen (7x7 Muster + 1 Modul heller Separator), in Zeilen/Spalten der Matrix.
+    near = range(QR_BORDER, QR_BORDER + 8)
+    far = range(n - QR_BORDER - 8, n - QR_BORDER)
+
+    runs = []
+    for i, row in enumerate(matrix):
+        if i in near:
+            skip = (near, far)
+        elif i in far:
+            skip = (near,)
+        else:
+            skip = ()
+        row_y = n - 1 - i
+        j = 0
+        while j < n:
+            if not row[j] or any(j in zone for zone in skip):
+                j += 1
+                continue
+            # Zusammenhängende dunkle Module einer Zeile als ein Rechteck zeichnen.
+            run_start = j
+            while j < n and row[j] and not any(j in zone for zone in skip):
+                j += 1
+            runs.append((run_start, row_y, j - run_start))
+    return n, tuple(runs)
+
+
+def prefetch_qr_matrices(texts: list[str]) -> dict[str, QrMatrix]:
+    """Encode QR symbols for texts in worker processes; {} if not worthwhile or not possible."""
+    workers = min(os.cpu_count() or 1, 8, len(texts) // PARALLEL_QR_MIN_CHUNK)
+    if workers < 2:
+        return {}
+    try:
+        # "spawn" auf allen Plattformen: die GUI ruft dies aus einem Worker-Thread auf,
+        # fork() aus einem Prozess mit mehreren Threads ist unsicher.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+            chunksize = max(1, len(texts) // (workers * 4))
+            return dict(zip(texts, ex.map(make_qr_matrix, texts, chunksize=chunksize)))
+    except Exception:
+        # z.B. eingeschränkte Umgebungen ohne Prozess-Start: sequentiell im Zeichen-Loop kodieren.
+        return {}
+
+
+def draw_qr_vector(c: rl_canvas.Canvas, x: float, y: float, size: float, symbol: QrRuns) -> None:
+    """Draw a QR symbol (see qr_module_runs) as filled rectangles into [x, y, size, size].
+
+    The three finder patterns are identical for all symbols of the same size and are
+    referenced from a shared Form XObject; only the remaining modules are emitted per label.
+    """
+    n, runs = symbol
+
+    c.saveState()
+    c.translate(x, y)
+    c.scale(size / n, size / n)
+    c.doForm(_qr_finder_form(c, n))
+
+    # Ab hier in Modul-Einheiten (ganzzahlige Koordinaten -> kompakter Content-Stream).
+    p = c.beginPath()
+    for run_x, run_y, run_w in runs:
+        p.rect(run_x, run_y, run_w, 1)
+    c.drawPath(p, stroke=0, fill=1)
+    c.restoreState()
+
+
+def _qr_finder_form(c: rl_canvas.Canvas, n: int) -> str:
+    """Return the name of the finder-pattern Form for an n x n matrix, defining it on first use."""
+    name = f"qr_finder_{n}"
+    if c.hasForm(name):
+        return name
+    c.beginForm(name, 0, 0, n, n)
+    p = c.beginPath()
+    lo = QR_BORDER
+    hi = n - QR_BORDER - 7
+    # Untere linke Ecke jedes Musters in Form-Koordinaten (y nach oben).
+    for fx, fy in ((lo, hi), (hi, hi), (lo, lo)):
+        p.rect(fx, fy + 6, 7, 1)
+        p.rect(fx, fy, 7, 1)
+        p.rect(fx, fy + 1, 1, 5)
+        p.rect(fx + 6, fy + 1, 1, 5)
+        p.rect(fx + 2, fy + 2, 3, 3)
+    c.drawPath(p, stroke=0, fill=1)
+    c.endForm()
+    return name
+
+
 def draw_label(
     c: rl_canvas.Canvas,
     x: float,
@@ -192,8 +475,12 @@ def draw_label(
     text: str,
     kind: BarcodeKind,
     draw_border: bool,
+    qr_matrices: dict[str, QrMatrix] | None = None,
 ) -> None:
-    """Draw one label in the rectangle [x, y, label_w, label_h] (origin bottom-left)."""
+    """Draw one label in the rectangle [x, y, label_w, label_h] (origin bottom-left).
+
+    qr_matrices: optional pre-encoded QR matrices by text (disk cache / prefetch_qr_matrices).
+    """
     if draw_border:
         c.rect(x, y, layout.label_w, layout.label_h, stroke=1, fill=0)
 
@@ -204,19 +491,11 @@ def draw_label(
     code_y = y + (layout.label_h - code_size) / 2.0
 
     if kind == "QR":
-        dpi = 600
-        target_px = max(80, int(code_size * dpi / 72.0))
-        img = make_qr_image(text, target_px)
-        c.drawImage(ImageReader(img), code_x, code_y, width=code_size, height=code_size, preserveAspectRatio=True, mask=None)
+        matrix = qr_matrices.get(text) if qr_matrices else None
+        draw_qr_vector(c, code_x, code_y, code_size, qr_module_runs(matrix or make_qr_matrix(text)))
     else:
-        b = code128.Code128(text, barHeight=code_size * 0.85, humanReadable=False)
-        desired_w = code_size
-        scale = min(1.0, desired_w / float(b.width))
-        c.saveState()
-        c.translate(code_x, code_y + (code_size - b.barHeight) / 2.0)
-        c.scale(scale, 1.0)
-        b.drawOn(c, 0, 0)
-        c.restoreState()
+        bar_h = code_size * 0.85
+        draw_code128_vector(c, code_x, code_y + (code_size - bar_h) / 2.0, code_size, bar_h, code128_bars(text))
 
     text_x = code_x + code_size + pad
     font_size = max(5.5, min(8.0, (layout.label_h / mm) * 0.55))
@@ -224,6 +503,25 @@ def draw_label(
     c.drawString(text_x, y + (layout.label_h - font_size) / 2.0, text)
 
 
+def cell_origins(
+    layout: SheetLayout,
+    offset_x_mm: float = 0.0,
+    offset_y_mm: float = 0.0,
+    pitch_dx_mm: float = 0.0,
+    pitch_dy_mm: float = 0.0,
+) -> tuple[list[float], list[float]]:
+    """Bottom-left label origins in points on A4: (x per column, y per row)."""
+    _page_w, page_h = A4
+    # Effective pitch + offsets (points)
+    pitch_x = layout.pitch_x + (pitch_dx_mm * mm)
+    pitch_y = layout.pitch_y + (pitch_dy_mm * mm)
+    off_x = offset_x_mm * mm
+    off_y = offset_y_mm * mm
+    col_x = [layout.margin_left + col * pitch_x + off_x for col in range(layout.cols)]
+    row_y = [page_h - layout.margin_top - layout.label_h - r * pitch_y + off_y for r in range(layout.rows)]
+    return col_x, row_y
+
+
 def generate_pdf(
     output_path: str,
     start_number: int,
@@ -239,6 +537,9 @@ def generate_pdf(
     pitch_dx_mm: float = 0.0,         # added to pitch_x (distance between columns)
     pitch_dy_mm: float = 0.0,         # added to pitch_y (distance between rows)
     start_position: int = 1,          # 1..labels_per_page (first label slot on first page)
+    progress_cb: Callable[[int, int], None] | None = None,  # (pages_done, pages_total)
+    page_compression: bool = True,    # zlib für Seiten-Streams (kostet kaum Zeit, spart ~90% Größe)
+    qr_cache_dir: str | Path | None = None,  # QR-Matrizen zwischen Läufen auf Platte cachen
 ) -> Tuple[int, int]:
     """
     Returns: (pages_generated, next_number)
@@ -255,18 +556,34 @@ def generate_pdf(
     if not (1 <= start_position <= labels_per_page):
         raise ValueError(f"start_position must be between 1 and {labels_per_page}")
 
-    _page_w, page_h = A4
     first_page_capacity = labels_per_page - (start_position - 1)
     remaining_after_first = max(0, count - first_page_capacity)
-    pages = 1 + math.ceil(remaining_after_first / labels_per_page)
+    pages = 1 + (remaining_after_first + labels_per_page - 1) // labels_per_page
 
-    # Effective pitch + offsets (points)
-    pitch_x = layout.pitch_x + (pitch_dx_mm * mm)
-    pitch_y = layout.pitch_y + (pitch_dy_mm * mm)
-    off_x = offset_x_mm * mm
-    off_y = offset_y_mm * mm
+    # Zellkoordinaten einmal pro Lauf vorberechnen (linke untere Ecke je Spalte/Zeile).
+    col_x, row_y = cell_origins(layout, offset_x_mm, offset_y_mm, pitch_dx_mm, pitch_dy_mm)
 
-    c = rl_canvas.Canvas(output_path, pagesize=A4)
+    # Alle ASN-Texte des Laufs einmal formatieren (zfill statt Format-Spec, identisch für n > 0).
+    texts = [prefix + str(n).zfill(leading_zeros) for n in range(start_number, start_number + count)]
+
+    qr_matrices: dict[str, QrMatrix] = {}
+    qr_missing: list[str] = []
+    if kind == "QR":
+        if qr_cache_dir is not None:
+            qr_matrices = load_qr_disk_cache(Path(qr_cache_dir), texts)
+        qr_missing = [t for t in texts if t not in qr_matrices]
+        qr_encode: list[str] = []
+        for t in qr_missing:
+            matrix = cached_qr_matrix(t)
+            if matrix is None:
+                qr_encode.append(t)
+            else:
+                qr_matrices[t] = matrix
+        if len(qr_encode) >= PARALLEL_QR_MIN_LABELS:
+            # QR-Kodierung (Maskenbewertung) ist der CPU-Engpass und pro Label unabhängig.
+            qr_matrices.update(prefetch_qr_matrices(qr_encode))
+
+    c = rl_canvas.Canvas(output_path, pagesize=A4, pageCompression=1 if page_compression else 0)
 
     current = start_number
     remaining = count
@@ -279,22 +596,28 @@ def generate_pdf(
 
         for i in range(n_this_page):
             slot = first_slot_zero_based + i
-            r = slot // layout.cols
-            col = slot % layout.cols
+            r, col = divmod(slot, layout.cols)
 
-            x = layout.margin_left + col * pitch_x + off_x
-            y = page_h - layout.margin_top - layout.label_h - r * pitch_y + off_y
+            x = col_x[col]
+            y = row_y[r]
 
-            text = make_asn_text(prefix, current, leading_zeros)
-            draw_label(c, x, y, layout, text, kind, draw_border)
+            text = texts[current - start_number]
+            if kind == "QR" and text not in qr_matrices:
+                # Hier kodieren und merken, damit der Disk-Cache unten nicht erneut kodieren muss.
+                qr_matrices[text] = make_qr_matrix(text)
+            draw_label(c, x, y, layout, text, kind, draw_border, qr_matrices)
 
             current += 1
 
         remaining -= n_this_page
         if page_idx < pages - 1:
             c.showPage()
+        if progress_cb is not None:
+            progress_cb(page_idx + 1, pages)
 
     c.save()
+    if qr_cache_dir is not None and qr_missing:
+        store_qr_disk_cache(Path(qr_cache_dir), {t: qr_matrices[t] for t in qr_missing})
     return pages, current
 
 DEFAULT_SETTINGS = {
@@ -347,6 +670,8 @@ class App(ttk.Frame):
         self.var_pitch_dy = tk.StringVar(value=DEFAULT_SETTINGS["pitch_dy"])
 
         self._preview_imgtk: ImageTk.PhotoImage | None = None
+        self._generate_button: ttk.Button | None = None
+        self._progress: ttk.Progressbar | None = None
         self._count_entry: ttk.Entry | None = None
         self._pages_entry: ttk.Entry | None = None
         self._profile_combo: ttk.Combobox | None = None
@@ -354,6 +679,10 @@ class App(ttk.Frame):
 
         self._loading_settings = False
         self._save_job = None
+        self._last_saved_hash: str | None = None
+        self._preview_job = None
+        self._preview_key: tuple[str, BarcodeKind, bool] | None = None
+        self._preview_cache: OrderedDict[tuple[str, BarcodeKind, bool], Image.Image] = OrderedDict()
         self._pending_config_status: tuple[str, StatusLevel] | None = None
 
         # 1) Laden (überschreibt Defaults, falls config existiert)
@@ -371,22 +700,8 @@ class App(ttk.Frame):
 
 
     def _config_path(self) -> Path:
-        """
-        Cross-platform config path:
-        - Windows: %APPDATA%/paperless-ngx-asn-labels/config.json
-        - macOS: ~/Library/Application Support/paperless-ngx-asn-labels/config.json
-        - Linux: $XDG_CONFIG_HOME/paperless-ngx-asn-labels/config.json  (fallback ~/.config/...)
-        """
-        home = Path.home()
-
-        if os.name == "nt":
-            base = Path(os.environ.get("APPDATA", home / "AppData" / "Roaming"))
-        elif sys.platform == "darwin":
-            base = home / "Library" / "Application Support"
-        else:
-            base = Path(os.environ.get("XDG_CONFIG_HOME", home / ".config"))
-
-        return base / "paperless-ngx-asn-labels" / "config.json"
+        """config.json inside config_dir() (see there for the per-platform locations)."""
+        return config_dir() / "config.json"
 
     def _settings_snapshot(self) -> dict:
         return {
@@ -491,10 +806,16 @@ class App(ttk.Frame):
             return
         path = self._config_path()
         try:
+            payload = json.dumps(self._settings_to_dict(), indent=2, ensure_ascii=False)
+            # Unveränderten Inhalt nicht erneut schreiben (Trace-/Fokus-Events ohne echte Änderung).
+            h = hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+            if h == self._last_saved_hash and path.exists():
+                return
             path.parent.mkdir(parents=True, exist_ok=True)
             tmp = path.with_suffix(".tmp")
-            tmp.write_text(json.dumps(self._settings_to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+            tmp.write_text(payload, encoding="utf-8")
             tmp.replace(path)
+            self._last_saved_hash = h
             self._set_config_status("", "info")
         except Exception as e:
             self._set_config_status(f"Config konnte nicht gespeichert werden ({path}): {e}", "error")
@@ -510,6 +831,15 @@ class App(ttk.Frame):
                 pass
         self._save_job = self.after(500, self._save_settings_now)
 
+    def _schedule_preview(self) -> None:
+        # Debounce: beim Tippen nur einmal nach kurzer Pause neu rendern
+        if getattr(self, "_preview_job", None) is not None:
+            try:
+                self.after_cancel(self._preview_job)
+            except Exception:
+                pass
+        self._preview_job = self.after(150, self._update_preview)
+
     def _install_autosave_traces(self) -> None:
         # alle Variablen bei Änderung -> save schedulen
         vars_to_watch = [
@@ -556,7 +886,7 @@ class App(ttk.Frame):
                 ttk.Label(frm, text=hint, foreground="#555", wraplength=250, justify="left").grid(
                     row=row, column=2, columnspan=2, sticky="w", padx=(0, 10), pady=6
                 )
-            ent.bind("<KeyRelease>", lambda _e: self._update_preview())
+            ent.bind("<KeyRelease>", lambda _e: self._schedule_preview())
             if store == "count":
                 self._count_entry = ent
             elif store == "pages":
@@ -605,7 +935,7 @@ class App(ttk.Frame):
             ttk.Label(cal, text=label).grid(row=0, column=col, sticky="w", padx=(6, 4), pady=6)
             e = ttk.Entry(cal, textvariable=var, width=10)
             e.grid(row=0, column=col + 1, sticky="we", padx=(0, 10), pady=6)
-            e.bind("<KeyRelease>", lambda _e: self._update_preview())
+            e.bind("<KeyRelease>", lambda _e: self._schedule_preview())
             ttk.Label(cal, text=hint, foreground="#555", wraplength=130, justify="left").grid(
                 row=0, column=col + 2, sticky="w", padx=(0, 10), pady=6
             )
@@ -617,7 +947,7 @@ class App(ttk.Frame):
             ttk.Label(cal, text=label).grid(row=row, column=col, sticky="w", padx=(6, 4), pady=6)
             e = ttk.Entry(cal, textvariable=var, width=10)
             e.grid(row=row, column=col + 1, sticky="we", padx=(0, 10), pady=6)
-            e.bind("<KeyRelease>", lambda _e: self._update_preview())
+            e.bind("<KeyRelease>", lambda _e: self._schedule_preview())
             ttk.Label(cal, text=hint, foreground="#555", wraplength=130, justify="left").grid(
                 row=row, column=col + 2, sticky="w", padx=(0, 10), pady=6
             )
@@ -643,7 +973,8 @@ class App(ttk.Frame):
         btns.columnconfigure(0, weight=1)
         btns.columnconfigure(1, weight=1)
 
-        ttk.Button(btns, text="PDF erzeugen…", command=self.on_generate_pdf).grid(row=0, column=0, sticky="we", padx=(0, 6))
+        self._generate_button = ttk.Button(btns, text="PDF erzeugen…", command=self.on_generate_pdf)
+        self._generate_button.grid(row=0, column=0, sticky="we", padx=(0, 6))
         ttk.Button(btns, text="Ordner öffnen", command=self.on_open_folder).grid(row=0, column=1, sticky="we", padx=(6, 0))
 
         ttk.Button(btns, text="Config löschen", command=self.on_reset_config).grid(
@@ -673,6 +1004,8 @@ class App(ttk.Frame):
         ttk.Button(btns, text="Profile exportieren", command=self.on_export_profiles).grid(
             row=6, column=0, columnspan=2, sticky="we", pady=(6, 0)
         )
+        self._progress = ttk.Progressbar(btns, mode="determinate", maximum=1)
+        self._progress.grid(row=7, column=0, columnspan=2, sticky="we", pady=(10, 0))
 
         self.lbl_status = ttk.Label(self, text="", foreground=STATUS_COLORS["info"], wraplength=900, justify="left")
         self.lbl_status.grid(row=1, column=0, columnspan=2, sticky="we", pady=(10, 0))
@@ -841,7 +1174,7 @@ class App(ttk.Frame):
         labels_per_page = self._layout().labels_per_page
         first_page_capacity = labels_per_page - (start_position - 1)
         remaining_after_first = max(0, count - first_page_capacity)
-        return 1 + math.ceil(remaining_after_first / labels_per_page)
+        return 1 + (remaining_after_first + labels_per_page - 1) // labels_per_page
 
     def _effective_count_and_pages(self) -> tuple[int, int]:
         start_position = self._start_position()
@@ -892,12 +1225,18 @@ class App(ttk.Frame):
         )
 
     def _update_preview(self, *_args) -> None:
+        self._preview_job = None
         try:
             text = self._current_text()
             kind: BarcodeKind = "QR" if self.var_kind.get() == "QR" else "CODE128"
-            img = self._render_preview_image(text, kind, self.var_border.get())
-            self._preview_imgtk = ImageTk.PhotoImage(img)
-            self.preview.configure(image=self._preview_imgtk)
+            border = bool(self.var_border.get())
+            # Bild nur neu rendern, wenn sich Text/Code-Typ/Rahmen geändert haben
+            # (z.B. nicht bei Kalibrierungs- oder Mengen-Eingaben).
+            if (text, kind, border) != self._preview_key or self._preview_imgtk is None:
+                img = self._preview_image(text, kind, border)
+                self._preview_imgtk = ImageTk.PhotoImage(img)
+                self.preview.configure(image=self._preview_imgtk)
+                self._preview_key = (text, kind, border)
 
             count, pages = self._effective_count_and_pages()
             start_pos = self._start_position()
@@ -915,8 +1254,22 @@ class App(ttk.Frame):
             )
         except Exception as e:
             self.preview.configure(image="")
+            self._preview_key = None
             self._set_status(str(e), "warn")
 
+    def _preview_image(self, text: str, kind: BarcodeKind, border: bool) -> Image.Image:
+        # Kleiner LRU-Cache: Hin- und Herschalten (Code-Typ, Rahmen, Start-Nummer) rendert nicht neu.
+        key = (text, kind, border)
+        img = self._preview_cache.get(key)
+        if img is not None:
+            self._preview_cache.move_to_end(key)
+            return img
+        img = self._render_preview_image(text, kind, border)
+        self._preview_cache[key] = img
+        if len(self._preview_cache) > PREVIEW_CACHE_SIZE:
+            self._preview_cache.popitem(last=False)
+        return img
+
     def _render_preview_image(self, text: str, kind: BarcodeKind, border: bool) -> Image.Image:
         preview_w, preview_h = 440, 180
         img = Image.new("RGB", (preview_w, preview_h), "white")
@@ -930,7 +1283,9 @@ class App(ttk.Frame):
 
         if kind == "QR":
             qr = make_qr_image(text, max(100, code_box_h))
-            img.paste(qr, (code_x, code_y))
+            qx = code_x + (code_box_w - qr.size[0]) // 2
+            qy = code_y + (code_box_h - qr.size[1]) // 2
+            img.paste(qr, (qx, qy))
         else:
             barcode = make_code128_preview_image(
                 text,
@@ -965,11 +1320,12 @@ class App(ttk.Frame):
 
             count, _pages = self._effective_count_and_pages()
             start_pos = self._start_position()
+            layout_key = self._layout_key()
             layout = self._layout()
             kind: BarcodeKind = "QR" if self.var_kind.get() == "QR" else "CODE128"
             off_x, off_y, pdx, pdy = self._calibration()
 
-            default_name = f"asn_labels_{self._layout_key().lower()}_{start}_{count}.pdf"
+            default_name = f"asn_labels_{layout_key.lower()}_{start}_{count}.pdf"
             out = filedialog.asksaveasfilename(
                 title="PDF speichern",
                 defaultextension=".pdf",
@@ -978,36 +1334,83 @@ class App(ttk.Frame):
             )
             if not out:
                 return
+        except Exception as e:
+            self._set_status(str(e), "error")
+            messagebox.showerror("Fehler", str(e))
+            return
 
-            pages_generated, next_number = generate_pdf(
-                output_path=out,
-                start_number=start,
-                count=count,
-                prefix=prefix,
-                leading_zeros=zeros,
-                kind=kind,
-                layout=layout,
-                draw_border=self.var_border.get(),
-                offset_x_mm=off_x,
-                offset_y_mm=off_y,
-                pitch_dx_mm=pdx,
-                pitch_dy_mm=pdy,
-                start_position=start_pos,
-            )
+        # PDF im Hintergrund erzeugen, damit die GUI bedienbar bleibt.
+        # Der Worker meldet nur über die Queue; Tk wird ausschließlich im Mainloop angefasst.
+        q: queue.Queue = queue.Queue()
+        kwargs = dict(
+            output_path=out,
+            start_number=start,
+            count=count,
+            prefix=prefix,
+            leading_zeros=zeros,
+            kind=kind,
+            layout=layout,
+            draw_border=self.var_border.get(),
+            offset_x_mm=off_x,
+            offset_y_mm=off_y,
+            pitch_dx_mm=pdx,
+            pitch_dy_mm=pdy,
+            start_position=start_pos,
+            qr_cache_dir=default_qr_cache_dir(),
+        )
 
-            self.var_start.set(str(next_number))
-            self._update_preview()
-            self._set_status(
-                f"PDF: {out} | Layout: {self._layout_key()} | Seiten: {pages_generated} | Labels: {count} | Startposition: {start_pos} | Nächster Start: {next_number}",
-                "success",
-            )
+        def run() -> None:
             try:
-                self._open_after_generate(out)
+                result = generate_pdf(**kwargs, progress_cb=lambda done, total: q.put(("progress", done, total)))
+                q.put(("done", *result))
             except Exception as e:
-                self._set_status(f"PDF erzeugt, aber Öffnen fehlgeschlagen: {e}", "warn")
-        except Exception as e:
+                q.put(("error", e))
+
+        if self._generate_button is not None:
+            self._generate_button.configure(state="disabled")
+        if self._progress is not None:
+            self._progress.configure(value=0, maximum=1)
+        self._set_status(f"PDF wird erzeugt: {out}", "info")
+        threading.Thread(target=run, daemon=True).start()
+        self.after(100, self._drain_generate_queue, q, out, layout_key, count, start_pos)
+
+    def _drain_generate_queue(self, q: queue.Queue, out: str, layout_key: str, count: int, start_pos: int) -> None:
+        while True:
+            try:
+                msg = q.get_nowait()
+            except queue.Empty:
+                self.after(100, self._drain_generate_queue, q, out, layout_key, count, start_pos)
+                return
+            if msg[0] == "progress":
+                _tag, done, total = msg
+                if self._progress is not None:
+                    self._progress.configure(value=done, maximum=total)
+                self._set_status(f"PDF wird erzeugt: Seite {done}/{total}", "info")
+                continue
+            break
+
+        if self._generate_button is not None:
+            self._generate_button.configure(state="normal")
+
+        if msg[0] == "error":
+            e = msg[1]
+            if self._progress is not None:
+                self._progress.configure(value=0)
             self._set_status(str(e), "error")
             messagebox.showerror("Fehler", str(e))
+            return
+
+        _tag, pages_generated, next_number = msg
+        self.var_start.set(str(next_number))
+        self._update_preview()
+        self._set_status(
+            f"PDF: {out} | Layout: {layout_key} | Seiten: {pages_generated} | Labels: {count} | Startposition: {start_pos} | Nächster Start: {next_number}",
+            "success",
+        )
+        try:
+            self._open_after_generate(out)
+        except Exception as e:
+            self._set_status(f"PDF erzeugt, aber Öffnen fehlgeschlagen: {e}", "warn")
 
     def _open_path(self, path: str) -> None:
         open_path(path)
@@ -1082,6 +1485,65 @@ def _run_gui() -> int:
     return 0
 
 
+def generate_calibration_sweep(
+    output_path: str,
+    offsets_mm: list[tuple[float, float]],   # (offset_x_mm, offset_y_mm) je Seite
+    prefix: str = "ASN",
+    leading_zeros: int = 7,
+    kind: BarcodeKind = "QR",
+    layout: SheetLayout = AVERY_L4731,
+    pitch_dx_mm: float = 0.0,
+    pitch_dy_mm: float = 0.0,
+    start_number: int = 1,
+    page_compression: bool = True,
+) -> int:
+    """
+    Calibration sweep: one full sheet with label borders per offset candidate, each page
+    captioned with its effective offsets. Borders are always drawn (they are what is being
+    calibrated). All pages carry the same ASN texts, so every symbol is encoded only once.
+    Returns: pages_generated
+    """
+    if not offsets_mm:
+        raise ValueError("offsets_mm must not be empty")
+    if start_number <= 0:
+        raise ValueError("start_number must be > 0")
+    if leading_zeros < 0:
+        raise ValueError("leading_zeros must be >= 0")
+    if not prefix:
+        raise ValueError("prefix must not be empty")
+
+    # Raster ohne Offset einmal berechnen; pro Kandidat nur noch verschieben.
+    base_x, base_y = cell_origins(layout, 0.0, 0.0, pitch_dx_mm, pitch_dy_mm)
+    cells = [(base_x[col], base_y[r]) for r in range(layout.rows) for col in range(layout.cols)]
+    texts = [prefix + str(n).zfill(leading_zeros) for n in range(start_number, start_number + len(cells))]
+
+    c = rl_canvas.Canvas(output_path, pagesize=A4, pageCompression=1 if page_compression else 0)
+    for page_idx, (off_x_mm, off_y_mm) in enumerate(offsets_mm):
+        dx = off_x_mm * mm
+        dy = off_y_mm * mm
+        for (x, y), text in zip(cells, texts):
+            draw_label(c, x + dx, y + dy, layout, text, kind, True)
+        # Beschriftung unter der letzten Zeile (nicht über den Bogenrand hinaus).
+        c.setFont("Helvetica", 7)
+        c.drawString(
+            10 * mm,
+            max(3 * mm, base_y[-1] + dy - 4 * mm),
+            f"Kalibrierung {page_idx + 1}/{len(offsets_mm)}: Offset X {off_x_mm:+.2f} mm, Offset Y {off_y_mm:+.2f} mm"
+            f" | Pitch Δ X {pitch_dx_mm:+.2f} mm, Y {pitch_dy_mm:+.2f} mm",
+        )
+        if page_idx < len(offsets_mm) - 1:
+            c.showPage()
+    c.save()
+    return len(offsets_mm)
+
+
+def _parse_mm_list(value: str) -> list[float]:
+    try:
+        return [float(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ungültige mm-Liste: {value!r} (z.B. -1,-0.5,0,0.5,1)")
+
+
 def _build_arg_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         prog="paperless-asn-labels",
@@ -1103,6 +1565,18 @@ def _build_arg_parser() -> argparse.ArgumentParser:
     p.add_argument("--pitch-dx", type=float, default=BASE_CALIBRATION_MM["pitch_dx"], help="Effektiver Pitch Δ X in mm (CLI).")
     p.add_argument("--pitch-dy", type=float, default=BASE_CALIBRATION_MM["pitch_dy"], help="Effektiver Pitch Δ Y in mm (CLI).")
     p.add_argument("--open", choices=["none", "file", "folder"], default="none", help="Nach CLI-PDF öffnen.")
+    p.add_argument("--no-compression", action="store_true", help="Seiteninhalte unkomprimiert schreiben (CLI, z.B. zum Debuggen).")
+    p.add_argument(
+        "--sweep-x",
+        type=_parse_mm_list,
+        help="Kalibrier-Sweep: Δ-Werte in mm zu --offset-x, kommagetrennt (z.B. --sweep-x=-1,0,1). Eine Seite je Kombination, "
+        "immer volle Bögen mit Labelrahmen (nicht mit --count/--pages/--start-position kombinierbar).",
+    )
+    p.add_argument(
+        "--sweep-y",
+        type=_parse_mm_list,
+        help="Kalibrier-Sweep: Δ-Werte in mm zu --offset-y, kommagetrennt (z.B. --sweep-y=-0.5,0,0.5).",
+    )
     return p
 
 
@@ -1113,6 +1587,34 @@ def _run_cli(args: argparse.Namespace) -> int:
         raise ValueError("Bitte nur --count ODER --pages angeben, nicht beides.")
 
     layout = LAYOUTS[args.layout]
+    if args.sweep_x is not None or args.sweep_y is not None:
+        if args.count is not None or args.pages is not None or args.start_position != 1:
+            raise ValueError(
+                "--sweep-x/--sweep-y erzeugen immer volle Bögen; "
+                "nicht mit --count, --pages oder --start-position kombinierbar."
+            )
+        xs = args.sweep_x or [0.0]
+        ys = args.sweep_y or [0.0]
+        offsets = [(args.offset_x + ddx, args.offset_y + ddy) for ddy in ys for ddx in xs]
+        pages_generated = generate_calibration_sweep(
+            output_path=args.output,
+            offsets_mm=offsets,
+            prefix=args.prefix,
+            leading_zeros=args.zeros,
+            kind="QR" if args.kind == "QR" else "CODE128",
+            layout=layout,
+            pitch_dx_mm=args.pitch_dx,
+            pitch_dy_mm=args.pitch_dy,
+            start_number=args.start,
+            page_compression=not args.no_compression,
+        )
+        print(f"OK: {args.output} | layout={args.layout} | sweep pages={pages_generated}")
+        if args.open == "file":
+            open_path(args.output)
+        elif args.open == "folder":
+            open_path(str(Path(args.output).resolve().parent))
+        return 0
+
     if args.pages is not None:
         if args.pages <= 0:
             raise ValueError("--pages muss > 0 sein.")
@@ -1139,6 +1641,7 @@ def _run_cli(args: argparse.Namespace) -> int:
         pitch_dx_mm=args.pitch_dx,
         pitch_dy_mm=args.pitch_dy,
         start_position=args.start_position,
+        page_compression=not args.no_compression,
     )
     print(
         f"OK: {args.output} | layout={args.layout} | pages={pages_generated} | labels={count} | next={next_number}"
@@ -1171,6 +1674,9 @@ def main(argv: list[str] | None = None) -> int:
             args.pitch_dx != BASE_CALIBRATION_MM["pitch_dx"],
             args.pitch_dy != BASE_CALIBRATION_MM["pitch_dy"],
             args.open != "none",
+            args.no_compression,
+            args.sweep_x is not None,
+            args.sweep_y is not None,
         ]
     )
 